@@ -1,16 +1,33 @@
 # app/ai_service.py
 from __future__ import annotations
 
+import copy
+import importlib.util
 import json
 import re
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Tuple, TypedDict
+import orjson
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig
+from transformers import (
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    BitsAndBytesConfig,
+    StoppingCriteria,
+    StoppingCriteriaList,
+)
 import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
 from functools import partial
 
+from .analysis_cache import AnalysisCache, SemanticCache, make_cache_key
 from .settings import settings
 
+# torch.compile 사용 시 입력 길이를 이 배수로 맞춰 그래프 재컴파일을 줄임
+_PAD_BUCKET = 64
+
+# GPU는 한 번에 generate() 하나만 처리하므로 전용 단일 스레드에서 실행
+_GPU_EXEC = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gpu")
+
 # 서비스 레이어가 기대하는 필드 구조에 맞춘 JSON을 요청합니다.
 SYSTEM_PROMPT = """당신은 공감적인 한국어 일기 감정 분석 AI입니다.
 사용자가 작성한 일기 내용을 정확히 읽고, 그 내용에 맞는 감정 분석과 위로 메시지를 제공하세요.
@@ -38,6 +55,17 @@ SYSTEM_PROMPT = """당신은 공감적인 한국어 일기 감정 분석 AI입
 3. comfort_message는 반드시 일기 내용에 대한 공감이어야 합니다
 4. JSON만 출력하고 마크다운(```)이나 설명은 쓰지 마세요"""
 
+class DiaryAnalysis(TypedDict):
+    """analyze_diary 결과 구조 (서비스 레이어가 기대하는 필드)"""
+    summary: str
+    sentiment: Dict[str, Any]
+    emotion_scores: Dict[str, float]
+    primary_emotion: str
+    comfort_message: str
+    tags: List[str]
+
+_ANALYSIS_KEYS = frozenset(DiaryAnalysis.__annotations__)
+
 def _coerce_emotions(d: Dict[str, Any]) -> Dict[str, float]:
     # 한국어 키를 영어 키로 매핑
     mapping = {
@@ -56,33 +84,159 @@ def _coerce_emotions(d: Dict[str, Any]) -> Dict[str, float]:
         out[en_key] = round(v, 2)
     return out
 
+_JSON_DECODER = json.JSONDecoder()
+
 def _safe_json_loads(text: str) -> Dict[str, Any]:
     """모델 출력에서 JSON 추출 및 파싱"""
-    text = text.strip()
-
     # 1. 첫 번째 { 찾기
     start_idx = text.find('{')
     if start_idx == -1:
         raise ValueError("No JSON object found in text")
 
-    # 2. 중첩된 괄호를 고려하여 매칭되는 } 찾기
-    count = 0
-    end_idx = -1
-    for i in range(start_idx, len(text)):
-        if text[i] == '{':
-            count += 1
-        elif text[i] == '}':
-            count -= 1
-            if count == 0:
-                end_idx = i + 1
-                break
-
-    if end_idx == -1:
-        raise ValueError("No matching closing brace found")
+    # 2. 마지막 } 까지를 orjson으로 바로 파싱 (모델이 JSON만 출력한 일반적인 경우)
+    end_idx = text.rfind('}') + 1
+    try:
+        return orjson.loads(text[start_idx:end_idx])
+    except orjson.JSONDecodeError:
+        pass
+
+    # 3. 뒤에 설명/마크다운이 붙은 경우 첫 { 부터 JSON 객체 하나만 디코딩
+    parsed, _ = _JSON_DECODER.raw_decode(text, start_idx)
+    return parsed
+
+def _quantization_kwargs(mode: str) -> Dict[str, Any]:
+    """HF_QUANTIZATION 값에 맞는 from_pretrained 인자"""
+    if mode == "fp16":
+        return {"torch_dtype": torch.float16}
+    if mode == "int8":
+        # 8-bit 양자화 (Ampere 이상에서는 int8 tensor core 사용)
+        return {"quantization_config": BitsAndBytesConfig(load_in_8bit=True)}
+    # 4-bit 양자화 설정
+    return {
+        "quantization_config": BitsAndBytesConfig(
+            load_in_4bit=True,               # 4-bit 양자화 활성화
+            bnb_4bit_compute_dtype=torch.float16,  # 연산은 float16로
+            bnb_4bit_use_double_quant=True,  # 이중 양자화로 더 압축
+            bnb_4bit_quant_type="nf4"        # NormalFloat4 양자화 (LLM에 최적)
+        )
+    }
 
-    # 3. JSON 문자열 추출 및 파싱
-    json_str = text[start_idx:end_idx]
-    return json.loads(json_str)
+def _attn_implementation() -> str:
+    """FlashAttention-2가 설치되어 있으면 사용, 아니면 PyTorch SDPA"""
+    if torch.cuda.is_available() and importlib.util.find_spec("flash_attn") is not None:
+        return "flash_attention_2"
+    return "sdpa"
+
+class JsonObjectStop(StoppingCriteria):
+    """생성 중인 JSON 객체의 바깥 } 가 닫히면 해당 시퀀스의 생성을 중단
+
+    매 스텝 새로 생성된 토큰만 디코딩해서 문자열/이스케이프를 고려한 괄호 깊이를 추적합니다.
+    active가 False인 시퀀스(JSON을 기대하지 않는 프롬프트)는 중단하지 않습니다.
+    """
+
+    def __init__(self, tokenizer: Any, active: List[bool]) -> None:
+        self.tokenizer = tokenizer
+        self._active = list(active)
+        self._depth = [0] * len(active)
+        self._in_string = [False] * len(active)
+        self._escape = [False] * len(active)
+        self._done = [False] * len(active)
+
+    def feed(self, row: int, text: str) -> bool:
+        """row 시퀀스에 새 텍스트를 반영하고, JSON 객체가 닫혔으면 True"""
+        for ch in text:
+            if self._in_string[row]:
+                if self._escape[row]:
+                    self._escape[row] = False
+                elif ch == "\\":
+                    self._escape[row] = True
+                elif ch == '"':
+                    self._in_string[row] = False
+            elif ch == '"' and self._depth[row] > 0:
+                self._in_string[row] = True
+            elif ch == "{":
+                self._depth[row] += 1
+            elif ch == "}" and self._depth[row] > 0:
+                self._depth[row] -= 1
+                if self._depth[row] == 0:
+                    self._done[row] = True
+                    break
+        return self._done[row]
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        for row, token_id in enumerate(input_ids[:, -1].tolist()):
+            if self._active[row] and not self._done[row]:
+                self.feed(row, self.tokenizer.decode([token_id]))
+        return torch.tensor(self._done, dtype=torch.bool, device=input_ids.device)
+
+class MicroBatcher:
+    """짧은 시간 창(window) 안에 들어온 생성 요청을 모아 한 번의 배치 호출로 처리
+
+    generate_batch는 프롬프트 리스트를 받아 같은 순서의 결과 리스트를 돌려주는
+    동기 함수이며, 이벤트 루프를 막지 않도록 executor 스레드에서 실행됩니다.
+    """
+
+    def __init__(
+        self,
+        generate_batch: Callable[[List[str]], List[str]],
+        max_batch: int = 8,
+        window: float = 0.02,
+        executor: Executor | None = None,
+    ) -> None:
+        self._generate_batch = generate_batch
+        self._executor = executor
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _ensure_worker(self) -> None:
+        """현재 이벤트 루프에 배치 워커가 없으면 시작"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, prompt: str) -> str:
+        """프롬프트를 큐에 넣고 배치 결과 대기"""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((prompt, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        """첫 요청 이후 window 동안 최대 max_batch개까지 모으기"""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.window
+        while len(batch) < self.max_batch:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            prompts = [prompt for prompt, _ in batch]
+            try:
+                results = await self._loop.run_in_executor(
+                    self._executor, partial(self._generate_batch, prompts)
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
 
 class AIAnalysisService:
     """로컬 모델 기반 일기 분석/생성 서비스"""
@@ -97,72 +251,188 @@ class AIAnalysisService:
         print(f"[DEBUG] ENV file loaded from: {settings.model_config.get('env_file')}")
         print(f"[DEBUG] HF_MODEL_ID from settings: {settings.hf_model_id}")
         print(f"[DEBUG] HF_MAX_TOKENS from settings: {settings.hf_max_tokens}")
-        print(f"Loading model with 4-bit quantization: {settings.hf_model_id}")
-
-        # 4-bit 양자화 설정
-        quantization_config = BitsAndBytesConfig(
-            load_in_4bit=True,               # 4-bit 양자화 활성화
-            bnb_4bit_compute_dtype=torch.float16,  # 연산은 float16로
-            bnb_4bit_use_double_quant=True,  # 이중 양자화로 더 압축
-            bnb_4bit_quant_type="nf4"        # NormalFloat4 양자화 (LLM에 최적)
-        )
+        print(f"Loading model with {settings.hf_quantization} weights: {settings.hf_model_id}")
 
         self.tokenizer = AutoTokenizer.from_pretrained(
             settings.hf_model_id,
             token=settings.hf_token
         )
+        # 배치 생성은 왼쪽 패딩이어야 생성 토큰이 프롬프트 바로 뒤에 이어짐
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
         self.model = AutoModelForCausalLM.from_pretrained(
             settings.hf_model_id,
-            quantization_config=quantization_config,  # 양자화 설정 추가
+            **_quantization_kwargs(settings.hf_quantization),
+            attn_implementation=_attn_implementation(),
             device_map="auto",                        # GPU에 자동 배치
             token=settings.hf_token
         )
-        print(f"Model loaded successfully! (4-bit quantized, memory usage: ~3.5GB)")
+        print(f"Model loaded successfully! ({settings.hf_quantization}, {self.model.config._attn_implementation})")
+
+        if torch.cuda.is_available():
+            torch.backends.cuda.enable_flash_sdp(True)
+
+        # 고정된 SYSTEM_PROMPT는 한 번만 토큰화하고, prefill 결과(KV cache)도 미리 계산해둠
+        self._sys_ids = self.tokenizer(
+            SYSTEM_PROMPT, return_tensors="pt", add_special_tokens=True
+        ).input_ids.to(self.model.device)
+        self._sys_kv = None
+        if settings.hf_compile:
+            # static cache는 미리 계산한 DynamicCache와 함께 쓸 수 없으므로 토큰 prefix만 재사용
+            self.model.generation_config.cache_implementation = "static"
+            self.model.forward = torch.compile(self.model.forward, mode="reduce-overhead", fullgraph=False)
+        else:
+            try:
+                with torch.no_grad():
+                    self._sys_kv = self.model(self._sys_ids, use_cache=True).past_key_values
+            except Exception as e:
+                print(f"WARNING: SYSTEM_PROMPT KV cache precompute failed ({e}), using token prefix only.")
+
+        # 동일한 일기 재분석 시 generate()를 건너뛰기 위한 캐시
+        self._cache = AnalysisCache(
+            db_path=settings.analysis_cache_db or None,
+            maxsize=settings.analysis_cache_size,
+        )
 
-    def _generate_text(self, prompt: str) -> str:
-        """동기 함수: 실제 모델 실행"""
-        try:
+        # 비슷한 일기(임베딩 유사도)를 위한 시맨틱 캐시 - 선택 의존성이 없으면 비활성화
+        self._semantic_cache: SemanticCache | None = None
+        if settings.semantic_cache_enabled:
+            if SemanticCache.is_available():
+                self._semantic_cache = SemanticCache(
+                    model_id=settings.semantic_cache_model,
+                    threshold=settings.semantic_cache_threshold,
+                    index_path=settings.semantic_cache_index or None,
+                )
+            else:
+                print("WARNING: sentence-transformers/faiss not installed, semantic cache disabled.")
+
+        # 동시에 들어온 생성 요청을 모아서 한 번에 처리
+        self._batcher = MicroBatcher(
+            self._generate_batch,
+            max_batch=settings.hf_max_batch,
+            window=settings.hf_batch_window_ms / 1000,
+            executor=_GPU_EXEC,
+        )
+
+    def _tokenize(self, prompt: str) -> Dict[str, Any]:
+        """프롬프트 토큰화 - SYSTEM_PROMPT로 시작하면 미리 토큰화한 prefix 뒤에 나머지만 이어붙임"""
+        if not prompt.startswith(SYSTEM_PROMPT):
             inputs = self.tokenizer(prompt, return_tensors="pt").to(self.model.device)
+        else:
+            suffix_ids = self.tokenizer(
+                prompt[len(SYSTEM_PROMPT):], return_tensors="pt", add_special_tokens=False
+            ).input_ids.to(self.model.device)
+            input_ids = torch.cat([self._sys_ids, suffix_ids], dim=1)
+            inputs = {"input_ids": input_ids, "attention_mask": torch.ones_like(input_ids)}
+
+        if settings.hf_compile:
+            inputs = self._pad_to_bucket(inputs)
+        return inputs
+
+    def _pad_to_bucket(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """입력 길이를 _PAD_BUCKET 배수로 왼쪽 패딩 (컴파일된 그래프 재사용)"""
+        input_ids = inputs["input_ids"]
+        pad = -input_ids.shape[1] % _PAD_BUCKET
+        if pad == 0:
+            return inputs
+
+        pad_id = self.tokenizer.pad_token_id or self.tokenizer.eos_token_id
+        return {
+            "input_ids": torch.nn.functional.pad(input_ids, (pad, 0), value=pad_id),
+            "attention_mask": torch.nn.functional.pad(inputs["attention_mask"], (pad, 0), value=0),
+        }
+
+    def _prefix_cache_kwargs(self, prompt: str) -> Dict[str, Any]:
+        """SYSTEM_PROMPT prefill을 건너뛰기 위한 past_key_values (generate가 수정하므로 복사본 전달)"""
+        if self._sys_kv is None or not prompt.startswith(SYSTEM_PROMPT):
+            return {}
+        return {"past_key_values": copy.deepcopy(self._sys_kv)}
+
+    def _generation_kwargs(self, greedy: bool = False) -> Dict[str, Any]:
+        """generate() 공통 인자 (greedy=True면 샘플링 없이 디코딩)"""
+        common = {
+            "max_new_tokens": settings.hf_max_tokens,
+            "repetition_penalty": 1.1,
+            "pad_token_id": self.tokenizer.pad_token_id or self.tokenizer.eos_token_id,
+            "use_cache": True,  # KV cache 활성화로 생성 속도 2-3배 향상
+        }
+        if greedy:
+            return {**common, "do_sample": False}
 
-            # temperature가 너무 낮으면 inf/nan 문제 발생 가능
-            temperature = max(settings.hf_temperature, 0.1)
+        # temperature가 너무 낮으면 inf/nan 문제 발생 가능
+        temperature = max(settings.hf_temperature, 0.1)
+        return {
+            **common,
+            "temperature": temperature,
+            "do_sample": True,
+            "top_p": 0.95,  # 더 높은 확률 분포로 빠른 샘플링
+            "top_k": 40,    # 줄여서 샘플링 속도 향상
+        }
 
+    def _json_stopping_criteria(self, prompts: List[str]) -> StoppingCriteriaList:
+        """분석 프롬프트는 JSON 객체가 닫히는 즉시 생성 중단 (뒤따르는 잡담 토큰 절약)"""
+        active = [prompt.startswith(SYSTEM_PROMPT) for prompt in prompts]
+        return StoppingCriteriaList([JsonObjectStop(self.tokenizer, active)])
+
+    def _generate_text(self, prompt: str) -> str:
+        """동기 함수: 실제 모델 실행"""
+        inputs = self._tokenize(prompt)
+        try:
             outputs = self.model.generate(
                 **inputs,
-                max_new_tokens=settings.hf_max_tokens,
-                temperature=temperature,
-                do_sample=True,
-                top_p=0.95,  # 더 높은 확률 분포로 빠른 샘플링
-                top_k=40,    # 줄여서 샘플링 속도 향상
-                repetition_penalty=1.1,
-                pad_token_id=self.tokenizer.pad_token_id or self.tokenizer.eos_token_id,
-                use_cache=True,  # KV cache 활성화로 생성 속도 2-3배 향상
+                **self._prefix_cache_kwargs(prompt),
+                **self._generation_kwargs(),
+                stopping_criteria=self._json_stopping_criteria([prompt]),
             )
-
-            # 프롬프트 제거 (입력 토큰 수만큼 제거)
-            input_length = inputs['input_ids'].shape[1]
-            output_tokens = outputs[0][input_length:]
-            result = self.tokenizer.decode(output_tokens, skip_special_tokens=True)
-
-            return result.strip()
         except RuntimeError as e:
             # multinomial 샘플링 오류 발생 시 greedy decoding으로 재시도
             print(f"WARNING: Sampling error ({e}), retrying with greedy decoding...")
-            inputs = self.tokenizer(prompt, return_tensors="pt").to(self.model.device)
             outputs = self.model.generate(
                 **inputs,
-                max_new_tokens=settings.hf_max_tokens,
-                do_sample=False,
-                repetition_penalty=1.1,
-                pad_token_id=self.tokenizer.pad_token_id or self.tokenizer.eos_token_id,
-                use_cache=True,  # KV cache 활성화
+                **self._prefix_cache_kwargs(prompt),
+                **self._generation_kwargs(greedy=True),
+                stopping_criteria=self._json_stopping_criteria([prompt]),
+            )
+
+        # 프롬프트 제거 (입력 토큰 수만큼 제거)
+        input_length = inputs['input_ids'].shape[1]
+        output_tokens = outputs[0][input_length:]
+        result = self.tokenizer.decode(output_tokens, skip_special_tokens=True)
+        return result.strip()
+
+    def _generate_batch(self, prompts: List[str]) -> List[str]:
+        """동기 함수: 여러 프롬프트를 왼쪽 패딩해서 generate() 한 번으로 실행"""
+        if len(prompts) == 1:
+            # 단건은 SYSTEM_PROMPT KV cache를 재사용할 수 있는 경로로
+            return [self._generate_text(prompts[0])]
+
+        inputs = self.tokenizer(
+            prompts,
+            return_tensors="pt",
+            padding=True,
+            pad_to_multiple_of=_PAD_BUCKET if settings.hf_compile else None,
+        ).to(self.model.device)
+        try:
+            outputs = self.model.generate(
+                **inputs,
+                **self._generation_kwargs(),
+                stopping_criteria=self._json_stopping_criteria(prompts),
+            )
+        except RuntimeError as e:
+            print(f"WARNING: Sampling error ({e}), retrying batch with greedy decoding...")
+            outputs = self.model.generate(
+                **inputs,
+                **self._generation_kwargs(greedy=True),
+                stopping_criteria=self._json_stopping_criteria(prompts),
             )
-            input_length = inputs['input_ids'].shape[1]
-            output_tokens = outputs[0][input_length:]
-            result = self.tokenizer.decode(output_tokens, skip_special_tokens=True)
-            return result.strip()
 
-    async def analyze_diary(self, diary_text: str) -> Dict[str, Any]:
+        # 왼쪽 패딩이므로 모든 샘플의 생성 토큰은 같은 위치에서 시작
+        input_length = inputs['input_ids'].shape[1]
+        results = self.tokenizer.batch_decode(outputs[:, input_length:], skip_special_tokens=True)
+        return [r.strip() for r in results]
+
+    async def analyze_diary(self, diary_text: str) -> DiaryAnalysis:
         """일기 텍스트를 분석해서 서비스가 기대하는 딕셔너리 구조로 반환
         - 생성 모델이 summary/sentiment/emotion_scores/primary_emotion/comfort_message/tags 를 JSON으로 직접 출력
         """
@@ -172,13 +442,29 @@ class AIAnalysisService:
             + f'\n\n일기: "{diary_text}"\n출력:\n'
         )
 
-        loop = asyncio.get_event_loop()
-        raw = await loop.run_in_executor(None, partial(self._generate_text, prompt))
+        # 캐시 확인: 같은 일기 + 같은 모델 설정이면 이전 출력을 재사용
+        cache_key = make_cache_key(diary_text, settings.hf_model_id, settings.hf_temperature)
+        # SQLite 조회는 이벤트 루프를 막지 않도록 기본 스레드 풀에서 실행
+        raw = await asyncio.to_thread(self._cache.get, cache_key)
+        cache_hit = raw is not None
+
+        semantic_vec = None
+        if not cache_hit and self._semantic_cache is not None:
+            # 임베딩은 짧으므로 generate() 뒤에 줄 세우지 않고 기본 스레드 풀에서 실행
+            semantic_vec, similar = await asyncio.to_thread(self._semantic_cache.lookup, diary_text)
+            if similar is not None:
+                # 비슷한 일기의 분석 결과 재사용 (요약만 현재 일기로 교체)
+                similar["summary"] = diary_text[:50] + "..." if len(diary_text) > 50 else diary_text
+                return similar
+
+        if not cache_hit:
+            raw = await self._batcher.submit(prompt)
 
         # 2) JSON 파싱 (```json .. ``` 방지용)
         try:
             parsed = _safe_json_loads(raw)
         except Exception as e:
+            semantic_vec = None  # 폴백 결과는 시맨틱 캐시에 넣지 않음
             # 파싱 실패 시, 최소한의 폴백 (요약·태그·감정 라벨은 간단 생성)
             print(f"JSON 파싱 실패: {e}")
             print(f"모델 원본 출력: {raw[:200]}")
@@ -190,6 +476,10 @@ class AIAnalysisService:
                 "comfort_message": "일기를 작성해주셔서 감사합니다. 오늘 하루도 수고하셨어요!",
                 "tags": ["일기", "자동분석"],
             }
+        else:
+            # 파싱에 성공한 출력만 캐시에 저장
+            if not cache_hit:
+                await asyncio.to_thread(self._cache.set, cache_key, raw)
 
         # 3) emotion_scores 한-영 키 정리 + 범위 보정
         if isinstance(parsed.get("emotion_scores"), dict):
@@ -259,14 +549,17 @@ class AIAnalysisService:
             tags = [str(tags)]
         parsed["tags"] = [str(t) for t in tags][:5]
 
-        return {
-            "summary": parsed.get("summary", diary_text[:50] + "..." if len(diary_text) > 50 else diary_text),
-            "sentiment": parsed["sentiment"],
-            "emotion_scores": parsed.get("emotion_scores", {}),
-            "primary_emotion": primary_emotion,
-            "comfort_message": parsed["comfort_message"],
-            "tags": parsed["tags"],
-        }
+        # 8) 정규화한 parsed를 그대로 결과로 사용 (모델이 덧붙인 키만 제거)
+        parsed["primary_emotion"] = primary_emotion
+        parsed.setdefault("summary", diary_text[:50] + "..." if len(diary_text) > 50 else diary_text)
+        parsed.setdefault("emotion_scores", {})
+        for extra_key in parsed.keys() - _ANALYSIS_KEYS:
+            del parsed[extra_key]
+
+        if semantic_vec is not None:
+            self._semantic_cache.add(semantic_vec, parsed)
+
+        return parsed
 
     async def generate_followup_response(
         self,
@@ -283,10 +576,8 @@ class AIAnalysisService:
             "위 대화를 보고 따뜻하고 공감적인 답변을 3-5문장으로 작성해주세요.\n\n답변:"
         )
 
-        # CPU-bound 작업을 별도 스레드에서 실행
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, partial(self._generate_text, prompt))
-        return result    
+        # 다른 요청과 묶어서 별도 스레드에서 실행
+        return await self._batcher.submit(prompt)    
 # ---- 싱글톤 인스턴스 ----
 _ai_singleton: AIAnalysisService | None = None
 
@@ -296,3 +587,9 @@ def get_ai_service() -> AIAnalysisService:
         _ai_singleton = AIAnalysisService()
     return _ai_singleton
 
+
+def shutdown_ai_service() -> None:
+    """앱 종료 시 시맨틱 캐시 인덱스 저장 (모델이 로드된 경우에만)"""
+    if _ai_singleton is not None and _ai_singleton._semantic_cache is not None:
+        _ai_singleton._semantic_cache.save()
+
@@ -0,0 +1,188 @@
+"""
+AI 분석 결과 캐시
+동일한 일기를 다시 분석할 때 모델 생성을 건너뛰기 위한 LRU + SQLite 캐시
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+
+def make_cache_key(diary_text: str, model_id: str, temperature: float) -> str:
+    """정규화된 일기 텍스트와 모델 설정으로 캐시 키 생성"""
+    digest = hashlib.sha1(diary_text.strip().lower().encode("utf-8")).hexdigest()
+    return f"{model_id}:{temperature}:{digest}"
+
+
+class AnalysisCache:
+    """모델 원본 출력(JSON 문자열)을 저장하는 캐시
+
+    메모리에는 최근 사용 순으로 maxsize개까지 보관하고,
+    db_path가 주어지면 SQLite에도 저장해서 재시작 후에도 재사용합니다.
+    SQLite IO가 이벤트 루프를 막지 않도록 asyncio.to_thread로 호출하므로
+    메모리 캐시는 스레드 락으로 보호합니다 (SQLite 조회/저장 중에는 잡지 않음).
+    """
+
+    def __init__(self, db_path: Optional[str] = None, maxsize: int = 1024) -> None:
+        self.db_path = db_path
+        self.maxsize = maxsize
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        if self.db_path:
+            self._init_database()
+
+    def _init_database(self) -> None:
+        """캐시 테이블 초기화"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    raw_output TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            conn.commit()
+
+    def _remember(self, key: str, raw_output: str) -> None:
+        """메모리 캐시에 저장 (가장 오래된 항목부터 제거)"""
+        with self._lock:
+            self._memory[key] = raw_output
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시 조회 (메모리 → SQLite 순)"""
+        with self._lock:
+            raw_output = self._memory.get(key)
+            if raw_output is not None:
+                self._memory.move_to_end(key)
+                return raw_output
+
+        if not self.db_path:
+            return None
+
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT raw_output FROM analysis_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        self._remember(key, row[0])
+        return row[0]
+
+    def set(self, key: str, raw_output: str) -> None:
+        """캐시 저장"""
+        self._remember(key, raw_output)
+        if not self.db_path:
+            return
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO analysis_cache (cache_key, raw_output, created_at)
+                VALUES (?, ?, ?)
+                """,
+                (key, raw_output, datetime.now(timezone.utc).isoformat()),
+            )
+            conn.commit()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+
+class SemanticCache:
+    """임베딩 유사도 기반 캐시
+
+    문장 임베딩(L2 정규화)과 FAISS 내적 인덱스로 비슷한 일기를 찾아
+    threshold 이상이면 이전 분석 결과를 재사용합니다.
+    sentence-transformers / faiss는 첫 조회 시점에 로드됩니다.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        threshold: float = 0.92,
+        index_path: Optional[str] = None,
+    ) -> None:
+        self.model_id = model_id
+        self.threshold = threshold
+        self.index_path = index_path
+        self._encoder = None
+        self._index = None
+        self._results: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_available() -> bool:
+        """선택 의존성(sentence-transformers, faiss) 설치 여부"""
+        return (
+            importlib.util.find_spec("sentence_transformers") is not None
+            and importlib.util.find_spec("faiss") is not None
+        )
+
+    @property
+    def _results_path(self) -> str:
+        return f"{self.index_path}.json"
+
+    def _ensure_loaded(self) -> None:
+        """인코더와 인덱스 지연 로딩"""
+        if self._encoder is not None:
+            return
+
+        import faiss
+        from sentence_transformers import SentenceTransformer
+
+        encoder = SentenceTransformer(self.model_id)
+        dim = encoder.get_sentence_embedding_dimension()
+
+        if self.index_path and os.path.exists(self.index_path) and os.path.exists(self._results_path):
+            self._index = faiss.read_index(self.index_path)
+            with open(self._results_path, "rb") as f:
+                self._results = orjson.loads(f.read())
+        else:
+            self._index = faiss.IndexFlatIP(dim)
+        self._encoder = encoder
+
+    def lookup(self, text: str) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """(임베딩 벡터, 유사한 분석 결과 사본 또는 None) 반환"""
+        with self._lock:
+            self._ensure_loaded()
+            vec = self._encoder.encode(
+                [text], normalize_embeddings=True, convert_to_numpy=True
+            ).astype("float32")
+
+            if self._index.ntotal == 0:
+                return vec, None
+
+            scores, ids = self._index.search(vec, 1)
+            if scores[0][0] < self.threshold:
+                return vec, None
+            return vec, dict(self._results[ids[0][0]])
+
+    def add(self, vec: Any, result: Dict[str, Any]) -> None:
+        """lookup에서 받은 벡터와 분석 결과 저장"""
+        with self._lock:
+            self._index.add(vec)
+            self._results.append(result)
+
+    def save(self) -> None:
+        """인덱스와 분석 결과를 디스크에 저장"""
+        if not self.index_path or self._index is None:
+            return
+
+        import faiss
+
+        with self._lock:
+            faiss.write_index(self._index, self.index_path)
+            with open(self._results_path, "wb") as f:
+                f.write(orjson.dumps(self._results))
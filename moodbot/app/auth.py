@@ -1,36 +1,65 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from functools import lru_cache, partial
+from typing import Any, Callable, Optional, TypeVar
 
+import bcrypt
+import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jwt.exceptions import PyJWTError
 
 from .models import User
+from .settings import settings
 
 # JWT 설정
 SECRET_KEY = "your-secret-key-change-this-in-production"  # 프로덕션에서는 환경변수로 관리
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7일
 
-# 비밀번호 해싱
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 비밀번호 해싱 (bcrypt는 72바이트까지만 사용)
+BCRYPT_MAX_BYTES = 72
+
+# bcrypt 해싱/검증 전용 스레드 풀 (AI 모델용 GPU executor와 분리)
+_PASSWORD_EXEC = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="password"
+)
+
+T = TypeVar("T")
 
 # HTTP Bearer 토큰 스키마
 security = HTTPBearer()
 
 
+def _password_bytes(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_BYTES]
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """비밀번호 검증"""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode("utf-8"))
+    except ValueError:
+        # 해시 형식이 잘못된 경우
+        return False
 
 
 def get_password_hash(password: str) -> str:
     """비밀번호 해싱"""
-    return pwd_context.hash(password)
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
+    return bcrypt.hashpw(_password_bytes(password), salt).decode("utf-8")
+
+
+async def run_password_task(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """bcrypt가 포함된 동기 작업을 이벤트 루프 밖(전용 스레드 풀)에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_PASSWORD_EXEC, partial(func, *args, **kwargs))
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -46,13 +75,26 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+@lru_cache(maxsize=4096)
+def _decode_verified(token: str) -> Optional[dict]:
+    """서명 검증 + 디코딩 (같은 토큰은 HMAC 검증을 한 번만 수행)"""
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except PyJWTError:
+        return None
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """JWT 토큰 디코딩"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
+    payload = _decode_verified(token)
+    if payload is None:
+        return None
+
+    # 캐시된 결과라도 만료 시간은 매번 확인
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
         return None
+    return dict(payload)
 
 
 async def get_current_user(
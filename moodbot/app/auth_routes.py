@@ -5,7 +5,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from .auth import create_access_token
+from .auth import create_access_token, run_password_task
 from .schemas import Token, UserCreate, UserLogin, UserResponse
 from .user_db import UserStorage, get_user_storage
 
@@ -33,7 +33,8 @@ async def register(
         )
 
     # 사용자 생성
-    user = user_storage.create_user(
+    user = await run_password_task(
+        user_storage.create_user,
         username=user_data.username,
         email=user_data.email,
         password=user_data.password,
@@ -63,7 +64,9 @@ async def login(
     - **username**: 사용자 이름
     - **password**: 비밀번호
     """
-    user = user_storage.authenticate_user(login_data.username, login_data.password)
+    user = await run_password_task(
+        user_storage.authenticate_user, login_data.username, login_data.password
+    )
 
     if user is None:
         raise HTTPException(
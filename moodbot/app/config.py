@@ -4,6 +4,8 @@
 """
 
 import os
+from dataclasses import dataclass, field
+from functools import cache
 from pathlib import Path
 from typing import Optional
 
@@ -14,29 +16,40 @@ env_path = Path(__file__).parent.parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
 
+@dataclass(frozen=True, slots=True)
 class Settings:
-    """애플리케이션 설정"""
-
-    def __init__(self):
-        # HuggingFace 설정
-        self.HUGGINGFACE_TOKEN: Optional[str] = os.getenv("HUGGINGFACE_TOKEN")
-        self.HUGGINGFACE_MODEL: str = os.getenv(
-            "HUGGINGFACE_MODEL", "JaeJiMin/daily_hug"
-        )
-
-        # 애플리케이션 설정
-        self.DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
-
+    """애플리케이션 설정 (생성 후 변경 불가)"""
+
+    # HuggingFace 설정
+    HUGGINGFACE_TOKEN: Optional[str] = field(
+        default_factory=lambda: os.getenv("HUGGINGFACE_TOKEN")
+    )
+    HUGGINGFACE_MODEL: str = field(
+        default_factory=lambda: os.getenv("HUGGINGFACE_MODEL", "JaeJiMin/daily_hug")
+    )
+
+    # 애플리케이션 설정
+    DEBUG: bool = field(
+        default_factory=lambda: os.getenv("DEBUG", "False").lower() == "true"
+    )
+
+    def __post_init__(self) -> None:
         # 토큰 유효성 검사
         if self.HUGGINGFACE_TOKEN and self.HUGGINGFACE_TOKEN.startswith("hf_YOUR_TOKEN"):
             print("⚠️  경고: .env 파일에 실제 HuggingFace 토큰을 설정해주세요!")
             print("   토큰은 https://huggingface.co/settings/tokens 에서 발급받을 수 있습니다.")
-            self.HUGGINGFACE_TOKEN = None
+            object.__setattr__(self, "HUGGINGFACE_TOKEN", None)
 
     def is_huggingface_configured(self) -> bool:
         """HuggingFace 토큰이 올바르게 설정되었는지 확인"""
         return self.HUGGINGFACE_TOKEN is not None and len(self.HUGGINGFACE_TOKEN) > 0
 
 
+@cache
+def get_settings() -> Settings:
+    """설정 싱글톤 (환경 변수는 최초 1회만 읽음)"""
+    return Settings()
+
+
 # 싱글톤 인스턴스
-settings = Settings()
+settings = get_settings()
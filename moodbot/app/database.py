@@ -1,23 +1,130 @@
 from __future__ import annotations
 
-import json
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Iterable, List, Optional
+from typing import Any, Iterable, Iterator, List, Optional
+
+import orjson
 
 from .models import Conversation, DiaryEntry, EmotionScores, Sentiment
 
 
+def _dumps(value: Any) -> str:
+    """JSON 직렬화 (orjson은 한글을 그대로 두고 datetime을 ISO 8601로 직접 변환)"""
+    return orjson.dumps(value).decode("utf-8")
+
+
+def _loads(value: str) -> Any:
+    """JSON 역직렬화"""
+    return orjson.loads(value)
+
+
+# 자주 쓰는 SQL은 모듈 상수로 두어 sqlite3 문장 캐시(cached_statements)가 항상 적중하도록 함
+_INSERT_ENTRY = """
+    INSERT INTO diary_entries (
+        text, summary, sentiment_label, sentiment_score,
+        emotion_happiness, emotion_sadness, emotion_anger,
+        emotion_anxiety, emotion_calmness, emotion_excitement,
+        primary_emotion, comfort_message, tags, created_at, updated_at, conversations, user_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# _row_to_entry의 인덱스 순서와 일치하는 컬럼 목록 (SELECT *는 스키마 변경 시 순서가 어긋날 수 있음)
+_ENTRY_COLS = """
+    id, text, summary, sentiment_label, sentiment_score,
+    emotion_happiness, emotion_sadness, emotion_anger,
+    emotion_anxiety, emotion_calmness, emotion_excitement,
+    primary_emotion, comfort_message, tags, created_at, updated_at, conversations, user_id
+"""
+
+# 목록 화면용: conversations 자리에 NULL을 넣어 JSON을 읽지도, 파싱하지도 않음
+_ENTRY_COLS_WITHOUT_CONVERSATIONS = _ENTRY_COLS.replace("conversations", "NULL")
+
+_SELECT_ENTRY_BY_ID = f"SELECT {_ENTRY_COLS} FROM diary_entries WHERE id = ?"
+
+_SELECT_ENTRY_BY_ID_AND_USER = f"SELECT {_ENTRY_COLS} FROM diary_entries WHERE id = ? AND user_id = ?"
+
+_UPDATE_ENTRY = f"""
+    UPDATE diary_entries SET
+        text = ?, summary = ?, sentiment_label = ?, sentiment_score = ?,
+        emotion_happiness = ?, emotion_sadness = ?, emotion_anger = ?,
+        emotion_anxiety = ?, emotion_calmness = ?, emotion_excitement = ?,
+        primary_emotion = ?, tags = ?, updated_at = ?
+    WHERE id = ?
+    RETURNING {_ENTRY_COLS}
+"""
+
+_UPDATE_CONVERSATIONS = """
+    UPDATE diary_entries SET
+        conversations = ?, updated_at = ?
+    WHERE id = ?
+"""
+
+_DELETE_ENTRY = "DELETE FROM diary_entries WHERE id = ?"
+
+_LIST_ENTRIES_BY_USER = f"SELECT {_ENTRY_COLS} FROM diary_entries WHERE user_id = ? ORDER BY created_at DESC"
+
+_LIST_ENTRIES = f"SELECT {_ENTRY_COLS} FROM diary_entries ORDER BY created_at DESC"
+
+_LIST_HEADERS_BY_USER = (
+    f"SELECT {_ENTRY_COLS_WITHOUT_CONVERSATIONS} FROM diary_entries WHERE user_id = ? ORDER BY created_at DESC"
+)
+
+_LIST_HEADERS = f"SELECT {_ENTRY_COLS_WITHOUT_CONVERSATIONS} FROM diary_entries ORDER BY created_at DESC"
+
+
 class DiaryStorage:
     """SQLite-based persistent storage for diary entries."""
 
     def __init__(self, db_path: str = "diary.db") -> None:
         self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
         self._init_database()
 
+    def _connect(self) -> sqlite3.Connection:
+        """튜닝된 PRAGMA가 적용된 연결 생성 (journal_mode 외에는 연결마다 설정해야 함)
+
+        isolation_level=None(autocommit)이므로 여러 문장을 묶을 때는 BEGIN/COMMIT을 직접 실행합니다.
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=128,
+        )
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA synchronous=NORMAL")  # WAL에서는 커밋마다 fsync하지 않아도 안전
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")  # 256MB
+        conn.execute("PRAGMA cache_size=-20000")  # 약 20MB
+        return conn
+
+    @contextmanager
+    def _locked(self) -> Iterator[sqlite3.Connection]:
+        """공유 연결을 잠금과 함께 제공 (첫 사용 시 연결 생성)
+
+        연결을 요청마다 새로 열지 않고 재사용해야 컴파일된 문장 캐시가 유지됩니다.
+        """
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._connect()
+            yield self._conn
+
+    def close(self) -> None:
+        """공유 연결 닫기"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def _init_database(self) -> None:
         """데이터베이스 테이블 초기화"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._locked() as conn:
+            # WAL 모드는 DB 파일에 유지됨: 읽기가 쓰기를 막지 않고 fsync 횟수가 줄어듦
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS diary_entries (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -58,19 +165,14 @@ class DiaryStorage:
             except sqlite3.OperationalError:
                 # 컬럼이 이미 존재하면 무시
                 pass
-            conn.commit()
 
     def _row_to_entry(self, row: tuple) -> DiaryEntry:
-        """데이터베이스 행을 DiaryEntry 객체로 변환"""
-        # 현재 스키마: id, text, summary, sentiment_label, sentiment_score,
-        # emotion_happiness, emotion_sadness, emotion_anger, emotion_anxiety, emotion_calmness, emotion_excitement,
-        # primary_emotion, comfort_message, tags, created_at, updated_at, conversations, user_id
-
-        # conversations 파싱 (인덱스 16)
+        """데이터베이스 행을 DiaryEntry 객체로 변환 (컬럼 순서는 _ENTRY_COLS)"""
+        # conversations 파싱 (인덱스 16, 목록 조회에서는 NULL)
         conversations = []
-        if len(row) > 16 and row[16]:
+        if row[16]:
             try:
-                conversations_data = json.loads(row[16])
+                conversations_data = _loads(row[16])
                 conversations = [
                     Conversation(
                         role=conv["role"],
@@ -79,11 +181,11 @@ class DiaryStorage:
                     )
                     for conv in conversations_data
                 ]
-            except (json.JSONDecodeError, KeyError, TypeError):
+            except (orjson.JSONDecodeError, KeyError, TypeError):
                 conversations = []
 
         # user_id 파싱 (인덱스 17)
-        user_id = row[17] if len(row) > 17 and row[17] is not None else 1
+        user_id = row[17] if row[17] is not None else 1
 
         # sentiment label 정리 (공백 제거 및 영어->한국어 변환)
         sentiment_label = (row[3] or "중립").strip()
@@ -111,34 +213,27 @@ class DiaryStorage:
             ),
             primary_emotion=row[11],
             user_id=user_id,
-            comfort_message=row[12] if len(row) > 12 else "",
-            tags=json.loads(row[13]) if len(row) > 13 else [],
+            comfort_message=row[12] or "",
+            tags=_loads(row[13]),
             conversations=conversations,
-            created_at=datetime.fromisoformat(row[14]) if len(row) > 14 else datetime.now(timezone.utc),
-            updated_at=datetime.fromisoformat(row[15]) if len(row) > 15 else datetime.now(timezone.utc),
+            created_at=datetime.fromisoformat(row[14]),
+            updated_at=datetime.fromisoformat(row[15]),
         )
 
     def add(self, entry: DiaryEntry) -> DiaryEntry:
-        # conversations를 JSON으로 직렬화
-        conversations_json = json.dumps([
+        # conversations를 JSON으로 직렬화 (timestamp는 orjson이 ISO 8601로 변환)
+        conversations_json = _dumps([
             {
                 "role": conv.role,
                 "message": conv.message,
-                "timestamp": conv.timestamp.isoformat()
+                "timestamp": conv.timestamp
             }
             for conv in entry.conversations
-        ], ensure_ascii=False)
+        ])
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._locked() as conn:
             cursor = conn.execute(
-                """
-                INSERT INTO diary_entries (
-                    text, summary, sentiment_label, sentiment_score,
-                    emotion_happiness, emotion_sadness, emotion_anger,
-                    emotion_anxiety, emotion_calmness, emotion_excitement,
-                    primary_emotion, comfort_message, tags, created_at, updated_at, conversations, user_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                _INSERT_ENTRY,
                 (
                     entry.text,
                     entry.summary,
@@ -152,14 +247,13 @@ class DiaryStorage:
                     entry.emotion_scores.excitement,
                     entry.primary_emotion,
                     entry.comfort_message,
-                    json.dumps(entry.tags, ensure_ascii=False),
+                    _dumps(entry.tags),
                     entry.created_at.isoformat(),
                     entry.updated_at.isoformat(),
                     conversations_json,
                     entry.user_id,
                 ),
             )
-            conn.commit()
             entry.id = cursor.lastrowid
         return entry
 
@@ -194,15 +288,11 @@ class DiaryStorage:
 
     def get_entry(self, entry_id: int, user_id: Optional[int] = None) -> Optional[DiaryEntry]:
         """ID로 일기 조회"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._locked() as conn:
             if user_id is not None:
-                cursor = conn.execute(
-                    "SELECT * FROM diary_entries WHERE id = ? AND user_id = ?", (entry_id, user_id)
-                )
+                cursor = conn.execute(_SELECT_ENTRY_BY_ID_AND_USER, (entry_id, user_id))
             else:
-                cursor = conn.execute(
-                    "SELECT * FROM diary_entries WHERE id = ?", (entry_id,)
-                )
+                cursor = conn.execute(_SELECT_ENTRY_BY_ID, (entry_id,))
             row = cursor.fetchone()
             if row is None:
                 return None
@@ -219,23 +309,12 @@ class DiaryStorage:
         primary_emotion: str,
         tags: List[str],
     ) -> Optional[DiaryEntry]:
-        """일기 수정"""
-        entry = self.get_entry(entry_id)
-        if entry is None:
-            return None
-
+        """일기 수정 (RETURNING으로 수정된 행을 한 번에 받음, SQLite 3.35 이상)"""
         updated_at = datetime.now(timezone.utc)
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                UPDATE diary_entries SET
-                    text = ?, summary = ?, sentiment_label = ?, sentiment_score = ?,
-                    emotion_happiness = ?, emotion_sadness = ?, emotion_anger = ?,
-                    emotion_anxiety = ?, emotion_calmness = ?, emotion_excitement = ?,
-                    primary_emotion = ?, tags = ?, updated_at = ?
-                WHERE id = ?
-                """,
+        with self._locked() as conn:
+            cursor = conn.execute(
+                _UPDATE_ENTRY,
                 (
                     text,
                     summary,
@@ -248,73 +327,72 @@ class DiaryStorage:
                     emotion_scores.calmness,
                     emotion_scores.excitement,
                     primary_emotion,
-                    json.dumps(tags, ensure_ascii=False),
+                    _dumps(tags),
                     updated_at.isoformat(),
                     entry_id,
                 ),
             )
-            conn.commit()
-
-        return self.get_entry(entry_id)
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return self._row_to_entry(row)
 
     def update_conversations(
         self, entry_id: int, conversations: List[Conversation], updated_at: datetime
     ) -> bool:
         """대화 목록 업데이트"""
-        conversations_json = json.dumps([
+        conversations_json = _dumps([
             {
                 "role": conv.role,
                 "message": conv.message,
-                "timestamp": conv.timestamp.isoformat()
+                "timestamp": conv.timestamp
             }
             for conv in conversations
-        ], ensure_ascii=False)
+        ])
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._locked() as conn:
             cursor = conn.execute(
-                """
-                UPDATE diary_entries SET
-                    conversations = ?, updated_at = ?
-                WHERE id = ?
-                """,
+                _UPDATE_CONVERSATIONS,
                 (conversations_json, updated_at.isoformat(), entry_id),
             )
-            conn.commit()
             return cursor.rowcount > 0
 
     def delete_entry(self, entry_id: int) -> bool:
         """일기 삭제"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM diary_entries WHERE id = ?", (entry_id,)
-            )
-            conn.commit()
+        with self._locked() as conn:
+            cursor = conn.execute(_DELETE_ENTRY, (entry_id,))
             return cursor.rowcount > 0
 
-    def list_entries(self, user_id: Optional[int] = None) -> List[DiaryEntry]:
-        """모든 일기 목록 (최신순)"""
-        with sqlite3.connect(self.db_path) as conn:
+    def _iter_entries(self, cursor: sqlite3.Cursor) -> Iterator[DiaryEntry]:
+        """커서를 한 행씩 읽으며 변환 (fetchall로 전체 행 튜플을 미리 만들지 않음)"""
+        for row in cursor:
+            yield self._row_to_entry(row)
+
+    def list_entries(
+        self, user_id: Optional[int] = None, *, include_conversations: bool = False
+    ) -> List[DiaryEntry]:
+        """모든 일기 목록 (최신순)
+
+        include_conversations가 False면 대화 목록은 읽지 않고 빈 목록으로 둡니다.
+        """
+        with self._locked() as conn:
             if user_id is not None:
                 print(f"DEBUG [DB list_entries]: Querying with user_id={user_id}")
-                cursor = conn.execute(
-                    "SELECT * FROM diary_entries WHERE user_id = ? ORDER BY created_at DESC", (user_id,)
-                )
+                sql = _LIST_ENTRIES_BY_USER if include_conversations else _LIST_HEADERS_BY_USER
+                cursor = conn.execute(sql, (user_id,))
             else:
                 print(f"DEBUG [DB list_entries]: Querying WITHOUT user_id filter")
-                cursor = conn.execute(
-                    "SELECT * FROM diary_entries ORDER BY created_at DESC"
-                )
-            rows = cursor.fetchall()
-            print(f"DEBUG [DB list_entries]: Found {len(rows)} rows")
-            if rows:
-                # Log first row's user_id
-                print(f"DEBUG [DB list_entries]: First row user_id={rows[0][17] if len(rows[0]) > 17 else 'N/A'}")
-            entries = [self._row_to_entry(row) for row in rows]
-            return entries
+                sql = _LIST_ENTRIES if include_conversations else _LIST_HEADERS
+                cursor = conn.execute(sql)
+            entries = list(self._iter_entries(cursor))
+        print(f"DEBUG [DB list_entries]: Found {len(entries)} rows")
+        if entries:
+            print(f"DEBUG [DB list_entries]: First row user_id={entries[0].user_id}")
+        return entries
 
     def all(self) -> Iterable[DiaryEntry]:
         """모든 일기 반환"""
-        return self.list_entries()
+        return self.list_entries(include_conversations=True)
 
 
 storage = DiaryStorage()
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from .ai_service import shutdown_ai_service
 from .auth_routes import auth_router
 from .database import DiaryStorage
 from .routes import api_router
@@ -14,6 +16,13 @@ from .user_db import UserStorage
 from .web import web_router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 종료 시 시맨틱 캐시 저장
+    shutdown_ai_service()
+
+
 def create_app() -> FastAPI:
     # 데이터베이스 초기화 (moodbot 디렉토리에 저장)
     db_path = Path(__file__).parent.parent / "diary.db"
@@ -26,6 +35,7 @@ def create_app() -> FastAPI:
         description="AI 기반 감정 분석 일기 서비스",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     # CORS 미들웨어 추가 (환경변수로 제어)
@@ -82,7 +82,10 @@ async def list_entries(
     service: DiaryService = Depends(get_diary_service),
 ) -> EntriesResponse:
 
-    entries = [serialize_entry(entry) for entry in service.list_entries()]
+    # 목록 응답도 각 일기의 대화 목록을 포함
+    entries = [
+        serialize_entry(entry) for entry in service.list_entries(include_conversations=True)
+    ]
     return EntriesResponse(entries=entries)
 
 
@@ -59,9 +59,13 @@ class DiaryService:
         """특정 일기 조회"""
         return self.storage.get_entry(entry_id, user_id=user_id)
 
-    def list_entries(self, user_id: Optional[int] = None) -> List[DiaryEntry]:
-        """모든 일기 목록 (최신순)"""
-        return self.storage.list_entries(user_id=user_id)
+    def list_entries(
+        self, user_id: Optional[int] = None, *, include_conversations: bool = False
+    ) -> List[DiaryEntry]:
+        """모든 일기 목록 (최신순, 대화 목록은 요청할 때만 포함)"""
+        return self.storage.list_entries(
+            user_id=user_id, include_conversations=include_conversations
+        )
 
     async def update_entry(self, entry_id: int, text: str) -> Optional[DiaryEntry]:
         """
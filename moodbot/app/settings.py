@@ -2,7 +2,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, model_validator
 from pathlib import Path
-from typing import List
+from typing import List, Literal
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -13,6 +13,41 @@ class Settings(BaseSettings):
     hf_timeout: int = Field(30, validation_alias="HF_TIMEOUT")
     hf_max_tokens: int = Field(512, validation_alias="HF_MAX_TOKENS")
     hf_temperature: float = Field(0.7, validation_alias="HF_TEMPERATURE")
+    hf_quantization: Literal["fp16", "int8", "nf4"] = Field(
+        "nf4",
+        validation_alias="HF_QUANTIZATION",
+        description="모델 가중치 정밀도 (fp16 / int8 / nf4 4-bit)"
+    )
+    hf_max_batch: int = Field(8, validation_alias="HF_MAX_BATCH")
+    hf_batch_window_ms: int = Field(
+        20,
+        validation_alias="HF_BATCH_WINDOW_MS",
+        description="동시 요청을 하나의 generate()로 묶기 위해 기다리는 시간(ms)"
+    )
+    hf_compile: bool = Field(
+        False,
+        validation_alias="HF_COMPILE",
+        description="torch.compile + static KV cache 사용 여부"
+    )
+
+    # ==== 분석 결과 캐시 ====
+    analysis_cache_size: int = Field(1024, validation_alias="ANALYSIS_CACHE_SIZE")
+    analysis_cache_db: str = Field(
+        default=str(BASE_DIR / "analysis_cache.db"),
+        validation_alias="ANALYSIS_CACHE_DB",
+        description="분석 캐시를 저장할 SQLite 경로 (빈 문자열이면 메모리만 사용)"
+    )
+    semantic_cache_enabled: bool = Field(True, validation_alias="SEMANTIC_CACHE_ENABLED")
+    semantic_cache_model: str = Field(
+        "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+        validation_alias="SEMANTIC_CACHE_MODEL",
+    )
+    semantic_cache_threshold: float = Field(0.92, validation_alias="SEMANTIC_CACHE_THRESHOLD")
+    semantic_cache_index: str = Field(
+        default=str(BASE_DIR / "semantic_cache.faiss"),
+        validation_alias="SEMANTIC_CACHE_INDEX",
+        description="FAISS 인덱스 저장 경로 (빈 문자열이면 저장하지 않음)"
+    )
 
     # ==== CORS 설정 ====
     cors_origins: List[str] = Field(
@@ -42,6 +77,15 @@ class Settings(BaseSettings):
         description="Preflight 요청 캐시 시간(초)"
     )
 
+    # ==== 인증 ====
+    bcrypt_rounds: int = Field(
+        12,
+        ge=4,
+        le=31,
+        validation_alias="BCRYPT_ROUNDS",
+        description="bcrypt 해싱 cost (2^rounds 반복)"
+    )
+
     # 공통
     env: str = Field("dev", validation_alias="ENV")
 
@@ -9,7 +9,7 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import EmailStr
 
-from .auth import create_access_token, decode_access_token
+from .auth import create_access_token, decode_access_token, run_password_task
 from typing import Optional as Opt
 from .models import DiaryEntry
 from .service import DiaryService, get_diary_service
@@ -48,11 +48,11 @@ def get_user_id_from_cookie(request: Request) -> Opt[int]:
         print(f"DEBUG: Token value: {token}")
         # Try to decode manually to see the error
         try:
-            from jose import jwt, JWTError
+            import jwt
             from .auth import SECRET_KEY, ALGORITHM
             test_payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
             print(f"DEBUG: Manual decode succeeded: {test_payload}")
-        except JWTError as e:
+        except jwt.PyJWTError as e:
             print(f"DEBUG: Manual decode error: {e}")
         return None
     # sub는 문자열로 저장되므로 정수로 변환
@@ -94,7 +94,10 @@ async def entries_page(
 ) -> HTMLResponse:
     user_id = get_user_id_from_cookie(request)
     print(f"DEBUG [entries_page]: user_id={user_id}")
-    entries = [serialize(entry) for entry in service.list_entries(user_id=user_id)]
+    entries = [
+        serialize(entry)
+        for entry in service.list_entries(user_id=user_id, include_conversations=True)
+    ]
     print(f"DEBUG [entries_page]: Found {len(entries)} entries for user_id={user_id}")
     for entry in entries[:3]:  # Log first 3 entries
         print(f"DEBUG [entries_page]: Entry {entry['id']} belongs to user_id (from entry data): N/A")
@@ -242,7 +245,7 @@ async def login(
     user_storage: UserStorage = Depends(get_user_storage),
 ) -> RedirectResponse:
     """로그인 처리"""
-    user = user_storage.authenticate_user(username, password)
+    user = await run_password_task(user_storage.authenticate_user, username, password)
 
     if user is None:
         # 로그인 실패 - 에러 메시지와 함께 로그인 페이지로
@@ -295,7 +298,9 @@ async def register(
         )
 
     # 사용자 생성
-    user = user_storage.create_user(username=username, email=email, password=password)
+    user = await run_password_task(
+        user_storage.create_user, username=username, email=email, password=password
+    )
 
     # JWT 토큰 생성 (sub는 문자열이어야 함)
     access_token = create_access_token(data={"sub": str(user.id), "username": user.username})
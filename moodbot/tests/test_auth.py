@@ -152,3 +152,35 @@ class TestAuthLogin:
         )
 
         assert response.status_code == 422  # Validation Error
+
+
+class TestAccessToken:
+    """JWT 토큰 디코딩 테스트"""
+
+    def test_decode_valid_token(self):
+        """정상 토큰 디코딩 (반복 호출도 같은 결과)"""
+        from app.auth import create_access_token, decode_access_token
+
+        token = create_access_token(data={"sub": "1", "username": "testuser"})
+
+        payload = decode_access_token(token)
+        assert payload["sub"] == "1"
+        assert payload["username"] == "testuser"
+        assert decode_access_token(token) == payload
+
+    def test_decode_invalid_token(self):
+        """잘못된 토큰은 None"""
+        from app.auth import decode_access_token
+
+        assert decode_access_token("invalid.token.value") is None
+
+    def test_cached_token_expires(self, monkeypatch):
+        """캐시된 토큰도 만료 시간이 지나면 None"""
+        from app import auth
+
+        token = auth.create_access_token(data={"sub": "1", "username": "testuser"})
+        payload = auth.decode_access_token(token)
+        assert payload is not None
+
+        monkeypatch.setattr(auth.time, "time", lambda: payload["exp"] + 1)
+        assert auth.decode_access_token(token) is None
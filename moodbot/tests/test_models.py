@@ -7,6 +7,7 @@ from datetime import datetime
 
 import pytest
 
+from app.analysis_cache import AnalysisCache, make_cache_key
 from app.models import Conversation, DiaryEntry, EmotionScores, Sentiment, User
 
 
@@ -149,6 +150,77 @@ class TestDiaryService:
         assert "부정" in counts
 
 
+class TestDiaryStorage:
+    """DiaryStorage 테스트"""
+
+    def test_entry_round_trip(self, diary_storage):
+        """태그/대화가 저장 후 그대로 복원"""
+        entry = diary_storage.create_entry(
+            text="저장 테스트",
+            summary="요약",
+            sentiment=Sentiment(label="긍정", score=0.8),
+            emotion_scores=EmotionScores(happiness=0.8),
+            primary_emotion="행복",
+            comfort_message="위로 메시지",
+            tags=["태그1", "태그2"],
+            user_id=1,
+        )
+        conversations = [Conversation(role="assistant", message="안녕하세요!")]
+        assert diary_storage.update_conversations(entry.id, conversations, entry.updated_at)
+
+        loaded = diary_storage.get_entry(entry.id, user_id=1)
+        assert loaded is not None
+        assert loaded.text == "저장 테스트"
+        assert loaded.tags == ["태그1", "태그2"]
+        assert loaded.emotion_scores.happiness == 0.8
+        assert [(c.role, c.message) for c in loaded.conversations] == [("assistant", "안녕하세요!")]
+        assert loaded.conversations[0].timestamp == conversations[0].timestamp
+        assert loaded.created_at == entry.created_at
+
+        # 목록 조회는 기본적으로 대화 목록을 읽지 않음
+        [header] = diary_storage.list_entries(user_id=1)
+        assert header.id == entry.id
+        assert header.conversations == []
+        [full] = diary_storage.list_entries(user_id=1, include_conversations=True)
+        assert [c.message for c in full.conversations] == ["안녕하세요!"]
+
+    def test_update_entry_returns_updated_row(self, diary_storage):
+        """수정 결과를 바로 반환하고, 없는 ID면 None"""
+        entry = diary_storage.create_entry(
+            text="수정 전",
+            summary="요약",
+            sentiment=Sentiment(label="중립", score=0.5),
+            emotion_scores=EmotionScores(calmness=0.5),
+            primary_emotion="평온",
+            tags=[],
+        )
+        updated = diary_storage.update_entry(
+            entry.id,
+            text="수정 후",
+            summary="새 요약",
+            sentiment=Sentiment(label="긍정", score=0.9),
+            emotion_scores=EmotionScores(happiness=0.9),
+            primary_emotion="행복",
+            tags=["수정"],
+        )
+        assert updated is not None
+        assert updated.text == "수정 후"
+        assert updated.tags == ["수정"]
+        assert updated.sentiment.label == "긍정"
+        assert updated.comfort_message == entry.comfort_message
+
+        missing = diary_storage.update_entry(
+            9999,
+            text="x",
+            summary="x",
+            sentiment=Sentiment(label="중립", score=0.5),
+            emotion_scores=EmotionScores(),
+            primary_emotion="평온",
+            tags=[],
+        )
+        assert missing is None
+
+
 class TestUserStorage:
     """UserStorage 테스트"""
 
@@ -221,3 +293,164 @@ class TestUserStorage:
         # 존재하지 않는 사용자
         user = user_storage.authenticate_user("nonexistent", "password123")
         assert user is None
+
+
+class TestAnalysisCache:
+    """AnalysisCache 테스트"""
+
+    def test_cache_key_normalization(self):
+        """공백/대소문자만 다른 일기는 같은 키"""
+        key1 = make_cache_key("  Hello 일기 ", "model", 0.7)
+        key2 = make_cache_key("hello 일기", "model", 0.7)
+        assert key1 == key2
+
+        # 모델이나 temperature가 다르면 다른 키
+        assert make_cache_key("hello 일기", "other", 0.7) != key1
+        assert make_cache_key("hello 일기", "model", 0.3) != key1
+
+    def test_lru_eviction(self):
+        """maxsize를 넘으면 가장 오래된 항목 제거"""
+        cache = AnalysisCache(maxsize=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")  # a를 최근 사용으로 갱신
+        cache.set("c", "3")
+
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+        assert len(cache) == 2
+
+    def test_persistence(self, test_db_path):
+        """SQLite에 저장된 캐시는 새 인스턴스에서도 조회 가능"""
+        AnalysisCache(db_path=test_db_path).set("key", '{"summary": "요약"}')
+
+        cache = AnalysisCache(db_path=test_db_path)
+        assert cache.get("key") == '{"summary": "요약"}'
+        assert cache.get("missing") is None
+
+
+class TestMicroBatcher:
+    """MicroBatcher 테스트"""
+
+    def test_concurrent_requests_are_batched(self):
+        """window 안에 들어온 요청은 한 번의 배치 호출로 처리"""
+        import asyncio
+
+        from app.ai_service import MicroBatcher
+
+        calls = []
+
+        def generate_batch(prompts):
+            calls.append(list(prompts))
+            return [p.upper() for p in prompts]
+
+        batcher = MicroBatcher(generate_batch, max_batch=8, window=0.05)
+
+        async def run():
+            return await asyncio.gather(*(batcher.submit(p) for p in ["a", "b", "c"]))
+
+        results = asyncio.run(run())
+
+        assert results == ["A", "B", "C"]
+        assert calls == [["a", "b", "c"]]
+
+    def test_max_batch_splits_requests(self):
+        """max_batch를 넘는 요청은 여러 배치로 나뉨"""
+        import asyncio
+
+        from app.ai_service import MicroBatcher
+
+        sizes = []
+
+        def generate_batch(prompts):
+            sizes.append(len(prompts))
+            return list(prompts)
+
+        batcher = MicroBatcher(generate_batch, max_batch=2, window=0.05)
+
+        async def run():
+            return await asyncio.gather(*(batcher.submit(str(i)) for i in range(5)))
+
+        assert asyncio.run(run()) == ["0", "1", "2", "3", "4"]
+        assert sizes == [2, 2, 1]
+
+
+class TestSafeJsonLoads:
+    """모델 출력 JSON 추출 테스트"""
+
+    def test_extracts_first_object(self):
+        """앞뒤 설명/마크다운과 문자열 속 괄호가 있어도 첫 객체만 파싱"""
+        from app.ai_service import _safe_json_loads
+
+        text = '```json\n{"summary": "괄호 } 포함", "tags": ["a"]}\n``` 설명'
+        assert _safe_json_loads(text) == {"summary": "괄호 } 포함", "tags": ["a"]}
+
+    def test_invalid_output_raises(self):
+        """JSON이 없거나 닫히지 않으면 ValueError"""
+        from app.ai_service import _safe_json_loads
+
+        with pytest.raises(ValueError):
+            _safe_json_loads("JSON 없음")
+        with pytest.raises(ValueError):
+            _safe_json_loads('{"summary": "미완성"')
+
+
+class TestQuantizationKwargs:
+    """HF_QUANTIZATION → from_pretrained 인자 매핑 테스트"""
+
+    @pytest.mark.parametrize(
+        "mode,bits",
+        [
+            pytest.param("fp16", None, id="fp16"),
+            pytest.param("int8", 8, id="int8"),
+            pytest.param("nf4", 4, id="nf4"),
+        ],
+    )
+    def test_mapping(self, mode, bits):
+        """fp16은 dtype만, int8/nf4는 해당 비트 수의 BitsAndBytesConfig"""
+        import torch
+
+        from app.ai_service import _quantization_kwargs
+
+        kwargs = _quantization_kwargs(mode)
+        if bits is None:
+            assert kwargs == {"torch_dtype": torch.float16}
+            return
+
+        config = kwargs["quantization_config"]
+        assert config.load_in_8bit is (bits == 8)
+        assert config.load_in_4bit is (bits == 4)
+        if bits == 4:
+            assert config.bnb_4bit_quant_type == "nf4"
+            assert config.bnb_4bit_use_double_quant is True
+
+
+class TestJsonObjectStop:
+    """JSON 객체 종료 감지 테스트"""
+
+    def test_stops_when_outer_object_closes(self):
+        """문자열 속 괄호/따옴표는 무시하고 바깥 } 에서만 종료"""
+        from app.ai_service import JsonObjectStop
+
+        stop = JsonObjectStop(tokenizer=None, active=[True])
+        chunks = ['출력:\n{"summary": "괄호 } 와 \\" 포함",', ' "sentiment": {"label": "긍정"}', "}"]
+
+        assert [stop.feed(0, chunk) for chunk in chunks] == [False, False, True]
+
+    def test_inactive_rows_never_stop(self):
+        """JSON을 기대하지 않는 시퀀스는 중단하지 않음"""
+        from app.ai_service import JsonObjectStop
+
+        import torch
+
+        class CharTokenizer:
+            def decode(self, ids):
+                return "".join(chr(i) for i in ids)
+
+        stop = JsonObjectStop(tokenizer=CharTokenizer(), active=[True, False])
+        done = None
+        for ch in "{}":
+            token = torch.tensor([[ord(ch)], [ord(ch)]])
+            done = stop(token, scores=None)
+        assert done.tolist() == [True, False]